@@ -2,7 +2,10 @@
 altair-nx: Draw interactive NetworkX graphs with Altair
 '''
 
+from ._version import version as __version__
+
 from .draw_altair import draw_networkx, draw_networkx_nodes, draw_networkx_edges
-from .util import copy_size_and_axes
+from .layout import cached_layout, fast_spring_layout
+from .util import copy_size_and_axes, enable_fast_serialization
 
 
@@ -1,29 +1,133 @@
+import numpy as np
 import pandas as pd
 import networkx as nx
 import altair as alt
 
-from math import atan2, sin, cos, pi, sqrt
+from math import sin, cos, pi
 from itertools import chain
 
 from .util import despine
 
 
-def to_pandas_nodes(G: nx.Graph, pos: dict[..., tuple[float, float]]):
+_AVOID_NODE_ATTRS = frozenset(('node', 'x', 'y')) # attribute names reserved for columns generated in the drawing process
+_AVOID_EDGE_ATTRS = frozenset(('edge', 'order', 'source', 'target', 'pair', 'x', 'y'))
+
+_NUMBA_MIN_CONTROL_POINTS = 8 # below this the NumPy slice-assignment loop is at least as fast as a compiled kernel
+_numba_control_point_kernel = None # cached compiled kernel, or False if numba is unavailable
+
+
+def _control_point_kernel():
+    '''Lazily import numba (an optional dependency) and compile the control-point fill kernel, caching the result.
+    Returns None if numba is not installed, in which case callers fall back to the NumPy path.
+    '''
+    global _numba_control_point_kernel
+    if _numba_control_point_kernel is None:
+        try: from numba import njit
+        except ImportError: _numba_control_point_kernel = False
+        else:
+            @njit(cache = True, fastmath = True)
+            def kernel(xy, starts, sx, sy, L, ca, sa, cps):
+                for i in range(len(starts)):
+                    for j in range(len(cps)):
+                        v, w = cps[j, 0], cps[j, 1]
+                        r = starts[i] + 1 + j
+                        xy[r, 0] = sx[i] + L[i] * (v * ca[i] - w * sa[i])
+                        xy[r, 1] = sy[i] + L[i] * (v * sa[i] + w * ca[i])
+            _numba_control_point_kernel = kernel
+    return _numba_control_point_kernel or None
+
+
+def _assert_no_reserved_attrs(view, avoid: frozenset, kind: str):
+    '''Assert that no element of the given node or edge view has attributes named in avoid
+    (a single pass with constant work per element, failing as soon as an offending attribute is met).
+    '''
+    for x in view: assert not (overlap := view[x].keys() & avoid), f'{kind} in G should not have attributes named any of {sorted(avoid)}; overlapping attributes: {overlap}'
+
+
+def _pos_to_array(G: nx.Graph, pos: dict[..., tuple[float, float]]):
+    '''Stack the pos dict into a contiguous (N,2) coordinate matrix (in G.nodes order) plus a node -> row mapping,
+    so that downstream code accesses coordinates by integer indexing instead of per-node dict lookups.
+
+    :param G: The graph to draw.
+    :param pos: The node positions of G, as produced by any of the `nx.*_layout functions`.
+
+    :return: A tuple (P, node_row) of the coordinate matrix and the node -> row dict.
+    '''
+    nodes = list(G.nodes)
+    return np.asarray([pos[n] for n in nodes], dtype = float).reshape(len(nodes), 2), {n: i for i, n in enumerate(nodes)}
+
+
+def _pair_categorical(edges: list, row_idx: np.ndarray):
+    '''Build the per-row 'pair' column as a categorical: integer codes over the distinct endpoint tuples
+    (still matched verbatim by subset filters), rather than one Python tuple object per row.
+    '''
+    code_of = {e: i for i, e in enumerate(dict.fromkeys(edges))} # distinct pairs in first-seen order (edges can repeat in multigraphs)
+    cats = np.empty(len(code_of), dtype = object)
+    cats[:] = list(code_of)
+    codes = np.fromiter((code_of[e] for e in edges), dtype = np.int32, count = len(edges))
+    return pd.Categorical.from_codes(codes[row_idx], categories = pd.Index(cats))
+
+
+def to_pandas_nodes(G: nx.Graph, pos: dict[..., tuple[float, float]], validate = True, _pos_array: tuple = None):
     '''Convert Graph nodes to pandas DataFrame meant for drawing with Altair.
     
     :param G: The graph to draw.
     :param pos: The node positions of G, as produced by any of the `nx.*_layout functions`, e.g. `nx.kamada_kawai_layout`.
         Note that most layouts use random seeds; for reproducible results set `np.random.seed(...)` before they are called.
+    :param validate: Whether to check that no node attribute uses a reserved column name;
+        callers which have already validated G once (e.g. `to_chart`) can skip the extra pass.
+    :param _pos_array: A pre-computed output of `_pos_to_array(G, pos)`, letting callers which build several frames
+        (e.g. `draw_networkx`) stack the coordinates once.
     
     :return: A pandas DataFrame of nodes.
     '''
-    assert not (overlap := set(chain.from_iterable(G.nodes[n].keys() for n in G.nodes)).intersection(avoid := ['node', 'x', 'y'])), f'nodes in G should not have attributes named any of {avoid}; overlapping attributes: {overlap}'
-    return pd.DataFrame([dict(node = n, x = pos[n][0], y = pos[n][1], **G.nodes[n]) for n in G.nodes], index = G.nodes)
+    if validate: _assert_no_reserved_attrs(G.nodes, _AVOID_NODE_ATTRS, 'nodes')
+
+    # Column-oriented construction: one (N,2) coordinate array and one list per attribute, rather than N per-node dicts
+    nodes = list(G.nodes)
+    xy = (_pos_array if _pos_array is not None else _pos_to_array(G, pos))[0]
+    columns = dict(node = nodes, x = xy[:, 0].astype(np.float32), y = xy[:, 1].astype(np.float32)) # float32 is ample for plotting and halves memory and JSON payload
+    for k in dict.fromkeys(chain.from_iterable(G.nodes[n].keys() for n in nodes)): columns[k] = [G.nodes[n].get(k) for n in nodes]
+    return pd.DataFrame(columns, index = nodes)
+
+
+
+def _edge_geometry(G: nx.Graph, pos: dict[..., tuple[float, float]], with_direction = True, pos_array: tuple = None):
+    '''Compute the shared straight-edge geometry used by both `to_pandas_edges` and `to_pandas_edge_arrows`:
+    endpoint coordinates stacked into (E,2) source and target arrays, a self-loop mask, and the edges' lengths and unit direction vectors.
+
+    :param G: The graph to draw.
+    :param pos: The node positions of G, as produced by any of the `nx.*_layout functions`.
+    :param with_direction: Whether lengths and unit directions are needed; callers which only place endpoints
+        (e.g. straight edges without control points) can skip their computation, making this a pure gather.
+    :param pos_array: A pre-computed output of `_pos_to_array(G, pos)` to reuse instead of stacking pos again.
+
+    :return: A tuple (edges, is_loop, src, tgt, L, unit) of the edge list and five aligned arrays (L and unit are None if not with_direction).
+    '''
+    edges = list(G.edges)
+    E = len(edges)
+
+    # One position lookup per node rather than two per edge; endpoint coordinates then come from integer indexing
+    P, node_row = pos_array if pos_array is not None else _pos_to_array(G, pos)
+    # Index on e[0]/e[1] rather than unpacking: multigraph edge views iterate as (u, v, key) 3-tuples
+    src_i = np.fromiter((node_row[e[0]] for e in edges), dtype = np.intp, count = E)
+    tgt_i = np.fromiter((node_row[e[1]] for e in edges), dtype = np.intp, count = E)
+    src, tgt = P[src_i], P[tgt_i]
+
+    L = unit = None
+    if with_direction:
+        D = tgt - src
+        L = np.hypot(D[:, 0], D[:, 1])
+        # The unit direction (i.e. the cosine and sine of the edge angle) is just D / L; no trig calls required
+        unit = np.divide(D, L[:, None], out = np.zeros_like(D), where = L[:, None] != 0)
+        unit[L == 0, 0] = 1. # matches the old atan2(0, 0) == 0 for coincident endpoints (self-loops never use their direction)
+
+    return edges, src_i == tgt_i, src, tgt, L, unit
 
 
 
 def to_pandas_edges(G: nx.Graph, pos: dict[..., tuple[float, float]], control_points: list[tuple[float, float]] = None,
-    loop_radius = .05, loop_angle = 90., loop_n_points = 30):
+    loop_radius = .05, loop_angle = 90., loop_n_points = 30, include_pair = True, validate = True, _geometry: tuple = None, _pos_array: tuple = None):
     '''Convert Graph edges to pandas DataFrame meant for drawing with Altair.
 
     :param G: The graph to draw.
@@ -41,64 +145,73 @@ def to_pandas_edges(G: nx.Graph, pos: dict[..., tuple[float, float]], control_po
         (in the straight-edge case, respectively: a short segment, a triangle, and a square).
         NOTE: to draw straight edges but interpolation-curved loops (rather than by high manual point count), set control_points to [] rather than None
         (or really any list of points whose 2nd coordinate is 0).
+    :param include_pair: Whether to include the 'pair' column (both endpoint labels as one tuple); it duplicates 'source' and 'target'
+        (stored as a categorical, costing one integer code per row), but is required for matching edges verbatim, e.g. by the subset arguments of the draw functions.
+    :param validate: Whether to check that no edge attribute uses a reserved column name;
+        callers which have already validated G once (e.g. `to_chart`) can skip the extra pass.
+    :param _geometry: A pre-computed output of `_edge_geometry(G, pos)` (with direction), letting callers which build
+        both the edge and arrow frames (e.g. `draw_networkx`) gather the endpoint geometry once.
+    :param _pos_array: A pre-computed output of `_pos_to_array(G, pos)` to reuse when _geometry is not supplied.
 
     :return: A pandas DataFrame of edges.
     '''
-    assert not (overlap := set(chain.from_iterable(G.edges[n].keys() for n in G.edges)).intersection(avoid := ['edge', 'order', 'source', 'target', 'pair', 'x', 'y'])), f'edges in G should not have attributes named any of {avoid}; overlapping attributes: {overlap}'
+    if validate: _assert_no_reserved_attrs(G.edges, _AVOID_EDGE_ATTRS, 'edges')
     loop_angle *= pi / 180
 
-    rows = []
-    for i, e in enumerate(G.edges):
-        Dx = pos[e[1]][0] - pos[e[0]][0]
-        Dy = pos[e[1]][1] - pos[e[0]][1]
-        D = sqrt(Dx ** 2 + Dy ** 2)
-        angle = atan2(Dy, Dx)
-        order = 0
-
-        rows.append(dict(
-            edge = i, order = order,
-            source = e[0], target = e[1], pair = e,
-            x = pos[e[0]][0], y = pos[e[0]][1],
-            **G.edges[e]
-        ))
-        order += 1
-
-        if e[0] == e[1]:
-            centre_x = pos[e[0]][0] + loop_radius * cos(loop_angle)
-            centre_y = pos[e[0]][1] + loop_radius * sin(loop_angle)
-            for n in range(1, loop_n_points): # Pairs of relative coordinates: (D proportion parallel to D, D proportion perpendicular to D)
-                point_angle = (loop_angle - pi + n * 2 * pi / loop_n_points) % (2 * pi)
-                rows.append(dict(
-                    edge = i, order = order,
-                    source = e[0], target = e[1], pair = e,
-                    x = centre_x + loop_radius * cos(point_angle),
-                    y = centre_y + loop_radius * sin(point_angle),
-                    **G.edges[e]
-                ))
-                order += 1
-        elif control_points:
-            for v, w in control_points: # Pairs of relative coordinates: (D proportion parallel to D, D proportion perpendicular to D)
-                rows.append(dict(
-                    edge = i, order = order,
-                    source = e[0], target = e[1], pair = e,
-                    x = pos[e[0]][0] + D * (v * cos(angle) - w * sin(angle)),
-                    y = pos[e[0]][1] + D * (v * sin(angle) + w * cos(angle)),
-                    **G.edges[e]
-                ))
-                order += 1
-
-        rows.append(dict(
-            edge = i, order = order,
-            source = e[0], target = e[1], pair = e,
-            x = pos[e[1]][0], y = pos[e[1]][1],
-            **G.edges[e]
-        ))
-
-    return pd.DataFrame(rows)
-
-
-
-def to_pandas_edge_arrows(G: nx.Graph, pos: dict[..., tuple[float, float]], length: float, length_is_relative = False, control_points: list[tuple[float, float]] = None):
+    edges, is_loop, src, tgt, L, unit = _geometry if _geometry is not None else _edge_geometry(G, pos, with_direction = bool(control_points), pos_array = _pos_array)
+    E = len(edges)
+
+    # Rows per edge: source + control points + target for normal edges, the full point circle for self-loops
+    counts = np.where(is_loop, 1 + loop_n_points, 2 + (len(control_points) if control_points else 0))
+    starts = np.cumsum(counts) - counts
+
+    xy = np.empty((counts.sum(), 2))
+    xy[starts] = src
+    xy[starts + counts - 1] = tgt
+
+    if control_points and not is_loop.all():
+        straight = ~is_loop
+        L, ca, sa = L[straight], unit[straight, 0], unit[straight, 1]
+        if len(control_points) >= _NUMBA_MIN_CONTROL_POINTS and (kernel := _control_point_kernel()) is not None:
+            kernel(xy, starts[straight], src[straight, 0].copy(), src[straight, 1].copy(), L, ca, sa, np.asarray(control_points, dtype = float))
+        else:
+            for j, (v, w) in enumerate(control_points): # Pairs of relative coordinates: (D proportion parallel to D, D proportion perpendicular to D)
+                xy[starts[straight] + 1 + j, 0] = src[straight, 0] + L * (v * ca - w * sa)
+                xy[starts[straight] + 1 + j, 1] = src[straight, 1] + L * (v * sa + w * ca)
+
+    if is_loop.any():
+        point_angles = (loop_angle - pi + np.arange(1, loop_n_points) * 2 * pi / loop_n_points) % (2 * pi)
+        centres = src[is_loop] + loop_radius * np.array([cos(loop_angle), sin(loop_angle)])
+        loop_rows = (starts[is_loop, None] + np.arange(1, loop_n_points)[None, :]).ravel()
+        xy[loop_rows] = (centres[:, None, :] + loop_radius * np.column_stack((np.cos(point_angles), np.sin(point_angles)))[None, :, :]).reshape(-1, 2)
+
+    edge_idx = np.repeat(np.arange(E, dtype = np.int32), counts) # int32 is ample for edge ids and point orders, and shrinks the frame
+    sources, targets = (np.empty(E, dtype = object) for _ in range(2))
+    sources[:] = [e[0] for e in edges] # indexed rather than unpacked since multigraph edges iterate as 3-tuples
+    targets[:] = [e[1] for e in edges]
+
+    # Node labels repeat heavily across rows, so store them as categoricals (integer codes over the node vocabulary)
+    nodes = list(G.nodes)
+    columns = dict(
+        edge = edge_idx, order = (np.arange(len(edge_idx)) - np.repeat(starts, counts)).astype(np.int32),
+        source = pd.Categorical(sources[edge_idx], categories = nodes), target = pd.Categorical(targets[edge_idx], categories = nodes)
+    )
+    if include_pair: columns['pair'] = _pair_categorical(edges, edge_idx) # one tuple per distinct pair instead of one per row
+    columns['x'], columns['y'] = xy[:, 0].astype(np.float32), xy[:, 1].astype(np.float32) # float32 is ample for plotting and halves memory and JSON payload
+    df = pd.DataFrame(columns)
+
+    # Let NetworkX collect the per-edge attributes in one pass over its adjacency (the same order as G.edges),
+    # then repeat them per row at C level, rather than re-merging each edge's dict into every row
+    edge_attrs = nx.to_pandas_edgelist(G).drop(columns = ['source', 'target'])
+    if edge_attrs.columns.size:
+        # nx.to_pandas_edgelist unions attribute keys via a set, so restore deterministic first-seen column order
+        edge_attrs = edge_attrs[list(dict.fromkeys(chain.from_iterable(d.keys() for _, _, d in G.edges(data = True))))]
+        df = pd.concat([df, edge_attrs.iloc[edge_idx].reset_index(drop = True)], axis = 1)
+    return df
+
+
+
+def to_pandas_edge_arrows(G: nx.Graph, pos: dict[..., tuple[float, float]], length: float, length_is_relative = False, control_points: list[tuple[float, float]] = None, include_pair = True, validate = True, _geometry: tuple = None):
     '''Convert Graph edge arrows to pandas DataFrame meant for drawing with Altair.
 
     Note that arrows are not drawn for self-loops since they would convey no extra information (and also to avoid unnecessary clutter).
@@ -111,41 +224,61 @@ def to_pandas_edge_arrows(G: nx.Graph, pos: dict[..., tuple[float, float]], leng
     :param control_points: Points to insert in the dataframe between the source and target point rows of each edge; they should be expressed as a tuple of coordinates relative to their straight edge:
         (proportion of edge length parallel to the edge, proportion of edge length perpendicular (anticlockwise) to the edge).
         E.g. [(.5, .1)] is a single control point halfway along the edge and .1 of its length to the left of it.
+    :param include_pair: Whether to include the 'pair' column (both endpoint labels as one tuple); it duplicates 'source' and 'target'
+        (stored as a categorical, costing one integer code per row), but is required for matching edges verbatim, e.g. by the subset arguments of the draw functions.
+    :param validate: Whether to check that no edge attribute uses a reserved column name;
+        callers which have already validated G once (e.g. `to_chart`) can skip the extra pass.
+    :param _geometry: A pre-computed output of `_edge_geometry(G, pos)` (with direction), letting callers which build
+        both the edge and arrow frames (e.g. `draw_networkx`) gather the endpoint geometry once.
 
     :return: A pandas DataFrame of edge arrows.
     '''
-    assert not (overlap := set(chain.from_iterable(G.edges[n].keys() for n in G.edges)).intersection(avoid := ['edge', 'order', 'source', 'target', 'pair', 'x', 'y'])), f'edges in G should not have attributes named any of {avoid}; overlapping attributes: {overlap}'
-
-    rows = []
-    for i, e in enumerate(G.edges):
-        if e[0] != e[1]: # Arrows convey no extra information in self-loops
-            Dx = pos[e[1]][0] - pos[e[0]][0]
-            Dy = pos[e[1]][1] - pos[e[0]][1]
-            D = sqrt(Dx ** 2 + Dy ** 2)
-            angle = atan2(Dy, Dx)
-
-            if control_points: # Shift direction from the source point to the last control point
-                v, w = control_points[-1]
-                Dx = pos[e[1]][0] - (pos[e[0]][0] + D * (v * cos(angle) - w * sin(angle)))
-                Dy = pos[e[1]][1] - (pos[e[0]][1] + D * (v * sin(angle) + w * cos(angle)))
-                angle = atan2(Dy, Dx)
-
-            rows.append(dict(
-                edge = i,
-                source = e[0], target = e[1], pair = e,
-                x = pos[e[1]][0], y = pos[e[1]][1],
-                **G.edges[e]
-            ))
-
-            rows.append(dict(
-                edge = i, # Yes, if arrow_length_is_relative Dx & Dy are reassembled from D and cos & sin; this is to keep the same expression regardless of control_points
-                source = e[0], target = e[1], pair = e,
-                x = pos[e[1]][0] - length * (D if length_is_relative else 1) * cos(angle),
-                y = pos[e[1]][1] - length * (D if length_is_relative else 1) * sin(angle),
-                **G.edges[e]
-            ))
-
-    return pd.DataFrame(rows)
+    if validate: _assert_no_reserved_attrs(G.edges, _AVOID_EDGE_ATTRS, 'edges')
+
+    all_edges, is_loop, src, tgt, L, unit = _geometry if _geometry is not None else _edge_geometry(G, pos)
+    keep = ~is_loop # Arrows convey no extra information in self-loops
+    edges = [e for e, k in zip(all_edges, keep) if k]
+    E = len(edges)
+    src, tgt, L, unit = src[keep], tgt[keep], L[keep], unit[keep]
+
+    if control_points: # Shift direction from the source point to the last control point
+        v, w = control_points[-1]
+        ca, sa = unit[:, 0], unit[:, 1]
+        D = tgt - (src + L[:, None] * np.column_stack((v * ca - w * sa, v * sa + w * ca)))
+        shift = np.hypot(D[:, 0], D[:, 1])
+        unit = np.divide(D, shift[:, None], out = np.zeros_like(D), where = shift[:, None] != 0)
+        unit[shift == 0, 0] = 1.
+
+    # Tip and tail rows interleaved by slice assignment into one pre-sized array
+    # (yes, if length_is_relative the offsets are reassembled from L and the unit direction; this is to keep the same expression regardless of control_points)
+    xy = np.empty((2 * E, 2))
+    xy[0::2] = tgt
+    xy[1::2] = tgt - unit * (length * L[:, None] if length_is_relative else length)
+
+    sources, targets = (np.empty(E, dtype = object) for _ in range(2))
+    sources[:] = [e[0] for e in edges] # indexed rather than unpacked since multigraph edges iterate as 3-tuples
+    targets[:] = [e[1] for e in edges]
+    row_idx = np.repeat(np.arange(E), 2)
+
+    # Node labels repeat heavily across rows, so store them as categoricals (integer codes over the node vocabulary)
+    nodes = list(G.nodes)
+    edge_idx = np.repeat(np.flatnonzero(keep), 2).astype(np.int32) # keep the indices of edges within G.edges, not within the loop-free subset
+    columns = dict(
+        edge = edge_idx,
+        source = pd.Categorical(sources[row_idx], categories = nodes), target = pd.Categorical(targets[row_idx], categories = nodes)
+    )
+    if include_pair: columns['pair'] = _pair_categorical(edges, row_idx) # one tuple per distinct pair instead of one per row
+    columns['x'], columns['y'] = xy[:, 0].astype(np.float32), xy[:, 1].astype(np.float32) # float32 is ample for plotting and halves memory and JSON payload
+    df = pd.DataFrame(columns)
+
+    # Let NetworkX collect the per-edge attributes in one pass over its adjacency (the same order as G.edges),
+    # then repeat them per row at C level, rather than re-merging each edge's dict into every row
+    edge_attrs = nx.to_pandas_edgelist(G).drop(columns = ['source', 'target'])
+    if edge_attrs.columns.size:
+        # nx.to_pandas_edgelist unions attribute keys via a set, so restore deterministic first-seen column order
+        edge_attrs = edge_attrs[list(dict.fromkeys(chain.from_iterable(d.keys() for _, _, d in G.edges(data = True))))]
+        df = pd.concat([df, edge_attrs.iloc[edge_idx].reset_index(drop = True)], axis = 1)
+    return df
 
 
 
@@ -158,10 +291,15 @@ def to_chart(G: nx.Graph, pos: dict[..., tuple[float, float]]):
     
     :return: An Altair chart with layers for G's edges and nodes.
     '''
-    node_df = to_pandas_nodes(G, pos)
+    # Validate attribute names and stack the coordinates once up front so the two builders need not repeat the passes
+    _assert_no_reserved_attrs(G.nodes, _AVOID_NODE_ATTRS, 'nodes')
+    _assert_no_reserved_attrs(G.edges, _AVOID_EDGE_ATTRS, 'edges')
+    pos_array = _pos_to_array(G, pos)
+
+    node_df = to_pandas_nodes(G, pos, validate = False, _pos_array = pos_array)
     node_layer = alt.Chart(node_df)
 
-    edge_df = to_pandas_edges(G, pos)
+    edge_df = to_pandas_edges(G, pos, validate = False, _pos_array = pos_array)
     edge_layer = alt.Chart(edge_df)
 
     chart = alt.LayerChart(layer = (edge_layer, node_layer))
@@ -1,13 +1,81 @@
+import numpy as np
+import pandas as pd
 import altair as alt
 import networkx as nx
 
-from copy import deepcopy
+import warnings
+from weakref import WeakKeyDictionary
 
-from .core import to_pandas_edges, to_pandas_edge_arrows, to_pandas_nodes
+from .core import to_pandas_edges, to_pandas_edge_arrows, to_pandas_nodes, _edge_geometry, _pos_to_array
+from .layout import _LAYOUTS, fast_spring_layout
+
+# The x/y channels are identical for every layer, so build them once: schemapi object construction is the main
+# fixed cost of assembling a layer spec. They are never mutated downstream (draw_networkx sets its final axis
+# domains on the top-level chart, not on the layers), so sharing them across charts is safe.
+_X_ENC, _Y_ENC = alt.X('x').axis(None), alt.Y('y').axis(None)
+
+_MAX_TOOLTIP_EDGES = 20_000 # beyond this many edges the invisible per-point hover marks make the chart unresponsive, so edge tooltips are dropped with a warning
+
+_frame_cache = WeakKeyDictionary() # G -> (key, (pos, chart_width, chart_height, df_edges, df_arrows, df_nodes)); one entry per graph, dropped with it (see draw_networkx's memoise argument)
+
+
+_CURVED_CONTROL_POINTS, _STRAIGHT_CONTROL_POINTS = ((.5, .1),), ((.5, 0.),) # shared default control points (a point halfway along the edge, off it or on it), built once
+
+_SCALAR_TYPES = (int, float, np.integer, np.floating) # accepted as fixed mark values where an attribute name (string) is the alternative
+
+
+def _route(name: str, value, channel: str, marker_attrs: dict, encoded_attrs: dict, legend = None, mark_channel: str = None):
+    '''Route a fixed-or-attribute size-like argument into the appropriate dict: an attribute name (string) becomes an
+    alt.Size encoding on channel, while a number is set directly on the mark (on mark_channel, or channel itself if None).
+    '''
+    if isinstance(value, str): encoded_attrs[channel] = alt.Size(value, legend = legend)
+    elif isinstance(value, _SCALAR_TYPES): marker_attrs[channel if mark_channel is None else mark_channel] = value
+    else: raise TypeError(f'{name} must be a string (attribute name) or a number.')
+
+
+def _line_style_attrs(df: pd.DataFrame, cols, width, width_channel: str, dash_and_gap_lengths, colour, cmap, alpha, tooltip, legend):
+    '''Build the mark and encode fields shared by the edge and arrow layers (width, dashes, colour, opacity and tooltip),
+    which differ only in the channel encoding an attribute-valued width.
+
+    :return: A (marker_attrs, encoded_attrs) pair of dictionaries for the layer's `.mark_line` and `.encode` calls.
+    '''
+    marker_attrs, encoded_attrs = {}, {}
+    legend = {} if legend else None
+
+    # Width
+    _route('width', width, width_channel, marker_attrs, encoded_attrs, legend, mark_channel = 'strokeWidth')
+
+    # Dashes
+    if dash_and_gap_lengths is not None: # allow no dashes
+        if not (isinstance(dash_and_gap_lengths, str) or (isinstance(dash_and_gap_lengths, tuple) and len(dash_and_gap_lengths) == 2 and isinstance(dash_and_gap_lengths[0], (float, int)) and isinstance(dash_and_gap_lengths[1], (float, int)))):
+            raise TypeError('dash_and_gap_lengths must be None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
+        if dash_and_gap_lengths in cols: encoded_attrs['strokeDash'] = alt.StrokeDash(dash_and_gap_lengths, legend = legend)
+        elif isinstance(dash_and_gap_lengths, str): raise ValueError(f'dash_and_gap_lengths was set to a string (\'{dash_and_gap_lengths}\') not matching any edge attribute; its allowed values are None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
+        else: marker_attrs['strokeDash'] = dash_and_gap_lengths
+
+    # Colour
+    if not isinstance(colour, str): raise TypeError('colour must be a string (either a colour or an edge attribute containing colour strings or floats for a colour map).')
+    elif colour in cols:
+        if cmap is None: encoded_attrs['color'] = alt.Color(colour, legend = legend)
+        elif isinstance(cmap, str):
+            if df[colour].dtype.kind == 'O': raise TypeError(f'the edge attribute ({colour}) to use with cmap {cmap} is non-numeric.')
+            else: encoded_attrs['color'] = alt.Color(colour, scale = alt.Scale(scheme = cmap), legend = legend)
+        else: raise TypeError('cmap must be a string (colourmap name) or None.')
+    else: marker_attrs['color'] = colour
+
+    # Opacity
+    if isinstance(alpha, str): encoded_attrs['opacity'] = alpha
+    elif isinstance(alpha, (int, float)): marker_attrs['opacity'] = alpha
+    elif alpha is not None: raise TypeError('alpha must be a string or None.')
+
+    # Tooltip
+    if tooltip is not None: encoded_attrs['tooltip'] = tooltip
+
+    return marker_attrs, encoded_attrs
 
 
 def draw_networkx_edges(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None,
-    chart: alt.Chart = None, layer: alt.Chart = None, subset: list = None,
+    chart: alt.Chart = None, layer: alt.Chart = None, df: pd.DataFrame = None, subset: list = None, subset_as_filter = False,
     width = 1, dash_and_gap_lengths: tuple[float, float] | str = None, colour = 'grey', cmap: str = None, alpha = 1.,
     tooltip: list[str] = None, legend = False,
     loop_radius = .05, loop_angle = 90., loop_n_points = 30,
@@ -25,7 +93,11 @@ def draw_networkx_edges(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :param chart: A pre-existing chart to draw over.
     :param layer: A pre-existing chart layer to draw in.
-    :param subset: Subset of edges to draw.
+    :param df: A pre-computed output of `to_pandas_edges` to draw instead of rebuilding it from G and pos
+        (used by draw_networkx to share one frame construction across layers).
+    :param subset: Subset of edges to draw; entries matching no edge are ignored.
+    :param subset_as_filter: Whether to apply subset as a Vega transform_filter on the full dataset instead of slicing the DataFrame;
+        this avoids copying the data and keeps a single canonical dataset in the spec (at the cost of shipping the filtered-out rows in it).
 
     :param width: Either an int or an edge attribute containing ints.
     :param dash_and_gap_lengths: None for a continuous line, or a pair of numbers representing the lengths of dashes and gaps between dashes, or an edge attribute containing the same or containing strings.
@@ -72,7 +144,7 @@ def draw_networkx_edges(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :return: An Altair chart of the edges of given graph.
     '''
-    if control_points is None: control_points = [(.5, .1)] if curved_edges else [(.5, 0.)] # default curve and at least one point in the middle in order to show tooltips
+    if control_points is None: control_points = _CURVED_CONTROL_POINTS if curved_edges else _STRAIGHT_CONTROL_POINTS # default curve and at least one point in the middle in order to show tooltips
 
     if layer is not None:
         df_edges = layer.data
@@ -80,70 +152,51 @@ def draw_networkx_edges(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
     elif chart is not None:
         df_edges = chart.layer[0].data
         edge_chart = chart.layer[0]
+    elif df is not None:
+        df_edges = df
+        edge_chart = alt.Chart(df_edges)
     elif G is not None:
         if pos is None: pos = nx.drawing.layout.kamada_kawai_layout(G)
+        if isinstance(subset, list) and not subset_as_filter: # drop unwanted edges before building rows: one graph-level scan instead of one over the repeated-row frame
+            keep = set(subset)
+            G, subset = nx.restricted_view(G, [], [e for e in G.edges if e not in keep]), None
         df_edges = to_pandas_edges(G, pos, control_points = control_points, loop_radius = loop_radius, loop_angle = loop_angle, loop_n_points = loop_n_points)
         edge_chart = alt.Chart(df_edges)
-    else: raise ValueError('one of G, chart or layer is required to draw.')
+    else: raise ValueError('one of G, chart, layer or df is required to draw.')
 
-    marker_attrs, encoded_attrs = {}, {}
-    legend = {} if legend else None
+    subset_filter = None
 
 
     # ---------- Handle the arguments ------------
 
     # Restrict to a given subset
-    if isinstance(subset, list):
-        df_edges = edge_chart.data = df_edges.loc[df_edges['pair'].isin(subset)]
+    if isinstance(subset, list): # hash the subset once and select positionally (cheaper than label-based .loc on the repeated-row frame)
+        kept = df_edges['pair'].isin(set(subset)).to_numpy()
+        # Note: the predicate is on the scalar 'edge' id rather than on 'pair' because tuples serialise to arrays, which Vega's oneOf cannot match
+        if subset_as_filter: subset_filter = alt.FieldOneOfPredicate(field = 'edge', oneOf = np.unique(df_edges['edge'].to_numpy()[kept]).tolist())
+        else: df_edges = edge_chart.data = df_edges.take(np.flatnonzero(kept))
     elif subset is not None: raise TypeError('subset must be a list or None.')
 
-    # Width
-    if isinstance(width, str): encoded_attrs['strokeWidth'] = alt.Size(width, legend = legend)
-    elif isinstance(width, (float, int)): marker_attrs['strokeWidth'] = width
-    else: raise TypeError('width must be a string or int.')
-
-    # Dashes
-    if dash_and_gap_lengths is not None: # allow no dashes
-        if not (isinstance(dash_and_gap_lengths, str) or (isinstance(dash_and_gap_lengths, tuple) and len(dash_and_gap_lengths) == 2 and isinstance(dash_and_gap_lengths[0], (float, int)) and isinstance(dash_and_gap_lengths[1], (float, int)))):
-            raise TypeError('dash_and_gap_lengths must be None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
-        if dash_and_gap_lengths in df_edges.columns: encoded_attrs['strokeDash'] = alt.StrokeDash(dash_and_gap_lengths, legend = legend)
-        elif isinstance(dash_and_gap_lengths, str): raise ValueError(f'dash_and_gap_lengths was set to a string (\'{dash_and_gap_lengths}\') not matching any edge attribute; its allowed values are None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
-        else: marker_attrs['strokeDash'] = dash_and_gap_lengths
-
-    # Colour
-    if not isinstance(colour, str): raise TypeError('colour must be a string (either a colour or an edge attribute containing colour strings or floats for a colour map).')
-    elif colour in df_edges.columns:
-        if cmap is None: encoded_attrs['color'] = alt.Color(colour, legend = legend)
-        elif isinstance(cmap, str):
-            if df_edges.dtypes[colour] == 'O': raise TypeError(f'the edge attribute ({colour}) to use with cmap {cmap} is non-numeric.')
-            else: encoded_attrs['color'] = alt.Color(colour, scale = alt.Scale(scheme = cmap), legend = legend)
-        else: raise TypeError('cmap must be a string (colourmap name) or None.')
-    else: marker_attrs['color'] = colour
-
-    # Opacity
-    if isinstance(alpha, str): encoded_attrs['opacity'] = alpha
-    elif isinstance(alpha, (int, float)): marker_attrs['opacity'] = alpha
-    elif alpha is not None: raise TypeError('alpha must be a string or None.')
+    # Width, dashes, colour, opacity and tooltip (shared with the arrow layer)
+    marker_attrs, encoded_attrs = _line_style_attrs(df_edges, df_edges.columns, width, 'strokeWidth', dash_and_gap_lengths, colour, cmap, alpha, tooltip, legend)
 
     # Curved edges
     if curved_edges:
         if isinstance(interpolation, str): marker_attrs['interpolate'] = interpolation
         else: raise TypeError('interpolate must be a string.')
-    
-    # Tooltip
-    if tooltip is not None: encoded_attrs['tooltip'] = tooltip
 
 
     # ---------- Finalise the fields and construct the visualisation ------------
 
     marker_attrs['point'] = alt.OverlayMarkDef(opacity = 0, size = 400) # to make triggering tooltips easier
-    encoded_attrs = dict(x = alt.X('x').axis(None), y = alt.Y('y').axis(None), detail = 'edge', order = 'order', **encoded_attrs)
+    encoded_attrs = dict(x = _X_ENC, y = _Y_ENC, detail = 'edge', order = 'order', **encoded_attrs)
 
     # Inject custom fields without restrictions or safeguards
     if mark_kwargs is not None: marker_attrs = dict(marker_attrs, **mark_kwargs)
     if encode_kwargs is not None: encoded_attrs = dict(encoded_attrs, **encode_kwargs)
 
     edge_chart = edge_chart.mark_line(**marker_attrs).encode(**encoded_attrs)
+    if subset_filter is not None: edge_chart = edge_chart.transform_filter(subset_filter)
 
     if chart is not None: chart.layer[0] = edge_chart
 
@@ -152,7 +205,7 @@ def draw_networkx_edges(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
 
 def draw_networkx_arrows(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None,
-    chart: alt.Chart = None, layer: alt.Chart = None, subset: list = None,
+    chart: alt.Chart = None, layer: alt.Chart = None, df: pd.DataFrame = None, subset: list = None, subset_as_filter = False,
     width = 1, dash_and_gap_lengths: tuple[float, float] | str = None, length = .1, length_is_relative = True,
     colour = 'grey', cmap: str = None, alpha = 1.,
     tooltip: list[str] = None, legend = False,
@@ -170,7 +223,11 @@ def draw_networkx_arrows(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :param chart: A pre-existing chart to draw over.
     :param layer: A pre-existing chart layer to draw in.
-    :param subset: Subset of edges for which to draw arrows.
+    :param df: A pre-computed output of `to_pandas_edge_arrows` to draw instead of rebuilding it from G and pos
+        (used by draw_networkx to share one frame construction across layers).
+    :param subset: Subset of edges for which to draw arrows; entries matching no edge are ignored.
+    :param subset_as_filter: Whether to apply subset as a Vega transform_filter on the full dataset instead of slicing the DataFrame;
+        this avoids copying the data and keeps a single canonical dataset in the spec (at the cost of shipping the filtered-out rows in it).
 
     :param width: Either an int or an edge attribute containing ints.
     :param dash_and_gap_lengths: None for a continuous line, or a pair of numbers representing the lengths of dashes and gaps between dashes, or an edge attribute containing the same or containing strings.
@@ -194,7 +251,7 @@ def draw_networkx_arrows(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :return: An Altair chart of the edges of given graph.
     '''
-    if control_points is None: control_points = [(.5, .1)] if curved_edges else [(.5, 0.)] # default curve and at least one point in the middle in order to show tooltips
+    if control_points is None: control_points = _CURVED_CONTROL_POINTS if curved_edges else _STRAIGHT_CONTROL_POINTS # default curve and at least one point in the middle in order to show tooltips
 
     if layer is not None:
         df_edge_arrows = layer.data
@@ -202,65 +259,46 @@ def draw_networkx_arrows(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
     elif chart is not None:
         df_edge_arrows = chart.layer[0].data
         edge_chart = chart.layer[0]
+    elif df is not None:
+        df_edge_arrows = df
+        edge_chart = alt.Chart(df_edge_arrows)
     elif G is not None:
         if pos is None: pos = nx.drawing.layout.kamada_kawai_layout(G)
+        if isinstance(subset, list) and not subset_as_filter: # drop unwanted edges before building rows: one graph-level scan instead of one over the repeated-row frame
+            keep = set(subset)
+            G, subset = nx.restricted_view(G, [], [e for e in G.edges if e not in keep]), None
         df_edge_arrows = to_pandas_edge_arrows(G, pos, length = length, length_is_relative = length_is_relative, control_points = control_points)
         edge_chart = alt.Chart(df_edge_arrows)
-    else: raise ValueError('one of G, chart or layer is required to draw.')
+    else: raise ValueError('one of G, chart, layer or df is required to draw.')
 
-    marker_attrs, encoded_attrs = {}, {}
-    legend = {} if legend else None
+    subset_filter = None
 
 
     # ---------- Handle the arguments ------------
 
     # Restrict to a given subset
-    if isinstance(subset, list):
-        df_edge_arrows = edge_chart.data = df_edge_arrows.loc[df_edge_arrows['pair'].isin(subset)]
+    if isinstance(subset, list): # hash the subset once and select positionally (cheaper than label-based .loc on the repeated-row frame)
+        kept = df_edge_arrows['pair'].isin(set(subset)).to_numpy()
+        # Note: the predicate is on the scalar 'edge' id rather than on 'pair' because tuples serialise to arrays, which Vega's oneOf cannot match
+        if subset_as_filter: subset_filter = alt.FieldOneOfPredicate(field = 'edge', oneOf = np.unique(df_edge_arrows['edge'].to_numpy()[kept]).tolist())
+        else: df_edge_arrows = edge_chart.data = df_edge_arrows.take(np.flatnonzero(kept))
     elif subset is not None: raise TypeError('subset must be a list or None.')
 
-    # Width
-    if isinstance(width, str): encoded_attrs['size'] = alt.Size(width, legend = legend)
-    elif isinstance(width, (float, int)): marker_attrs['strokeWidth'] = width
-    else: raise TypeError('arrow_width must be a string or int.')
-
-    # Dashes
-    if dash_and_gap_lengths is not None: # allow no dashes
-        if not (isinstance(dash_and_gap_lengths, str) or (isinstance(dash_and_gap_lengths, tuple) and len(dash_and_gap_lengths) == 2 and isinstance(dash_and_gap_lengths[0], (float, int)) and isinstance(dash_and_gap_lengths[1], (float, int)))):
-            raise TypeError('dash_and_gap_lengths must be None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
-        if dash_and_gap_lengths in df_edge_arrows.columns: encoded_attrs['strokeDash'] = alt.StrokeDash(dash_and_gap_lengths, legend = legend)
-        elif isinstance(dash_and_gap_lengths, str): raise ValueError(f'dash_and_gap_lengths was set to a string (\'{dash_and_gap_lengths}\') not matching any edge attribute; its allowed values are None or a pair of numbers representing the lengths of dashes and gaps between dashes or an edge attribute containing the same or containing strings.')
-        else: marker_attrs['strokeDash'] = dash_and_gap_lengths
-
-    # Colour
-    if not isinstance(colour, str): raise TypeError('colour must be a string (either a colour or an edge attribute containing colour strings or floats for a colour map).')
-    elif colour in df_edge_arrows.columns:
-        if cmap is None: encoded_attrs['color'] = alt.Color(colour, legend = legend)
-        elif isinstance(cmap, str):
-            if df_edge_arrows.dtypes[colour] == 'O': raise TypeError(f'the edge attribute ({colour}) to use with cmap {cmap} is non-numeric.')
-            else: encoded_attrs['color'] = alt.Color(colour, scale = alt.Scale(scheme = cmap), legend = legend)
-        else: raise TypeError('cmap must be a string (colourmap name) or None.')
-    else: marker_attrs['color'] = colour
-
-    # Opacity
-    if isinstance(alpha, str): encoded_attrs['opacity'] = alpha
-    elif isinstance(alpha, (int, float)): marker_attrs['opacity'] = alpha
-    elif alpha is not None: raise TypeError('alpha must be a string or None.')
-
-    # Tooltip
-    if tooltip is not None: encoded_attrs['tooltip'] = tooltip
+    # Width, dashes, colour, opacity and tooltip (shared with the edge layer; an attribute-valued width encodes as point size here)
+    marker_attrs, encoded_attrs = _line_style_attrs(df_edge_arrows, df_edge_arrows.columns, width, 'size', dash_and_gap_lengths, colour, cmap, alpha, tooltip, legend)
 
 
     # ---------- Finalise the fields and construct the visualisation ------------
 
     marker_attrs['point'] = alt.OverlayMarkDef(opacity = 0, size = 100) # to make triggering tooltips easier; smaller than edges' hover points to avoid overcrowding near nodes
-    encoded_attrs = dict(x = alt.X('x').axis(None), y = alt.Y('y').axis(None), detail = 'edge', **encoded_attrs)
+    encoded_attrs = dict(x = _X_ENC, y = _Y_ENC, detail = 'edge', **encoded_attrs)
 
     # Inject custom fields without restrictions or safeguards
     if mark_kwargs is not None: marker_attrs = dict(marker_attrs, **mark_kwargs)
     if encode_kwargs is not None: encoded_attrs = dict(encoded_attrs, **encode_kwargs)
 
     edge_chart = edge_chart.mark_line(**marker_attrs).encode(**encoded_attrs)
+    if subset_filter is not None: edge_chart = edge_chart.transform_filter(subset_filter)
 
     if chart is not None: chart.layer[0] = edge_chart
 
@@ -269,7 +307,7 @@ def draw_networkx_arrows(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
 
 def draw_networkx_nodes(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None,
-    chart: alt.Chart = None, layer: alt.Chart = None, subset: list = None,
+    chart: alt.Chart = None, layer: alt.Chart = None, df: pd.DataFrame = None, subset: list = None, subset_as_filter = False,
     size: int | str = 400, shape = 'circle',
     colour = 'teal', cmap: str = None, alpha = 1.,
     outline_width: float | str = 1., outline_dash_and_gap_lengths: tuple[float, float] | str = None, outline_colour: str = None,
@@ -287,7 +325,11 @@ def draw_networkx_nodes(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :param chart: A pre-existing chart to draw over.
     :param layer: A pre-existing chart layer to draw in.
-    :param subset: Subset of nodes to draw.
+    :param df: A pre-computed output of `to_pandas_nodes` to draw instead of rebuilding it from G and pos
+        (used by draw_networkx to share one frame construction across layers).
+    :param subset: Subset of nodes to draw; entries matching no node are ignored (as for the edge subsets).
+    :param subset_as_filter: Whether to apply subset as a Vega transform_filter on the full dataset instead of slicing the DataFrame;
+        this avoids copying the data and keeps a single canonical dataset in the spec (at the cost of shipping the filtered-out rows in it).
 
     :param size: Either an int or a node attribute containing ints.
     :param shape: Either an Altair point-mark shape specifier or a node attribute containing the same.
@@ -317,56 +359,61 @@ def draw_networkx_nodes(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
     elif chart is not None:
         df_nodes = chart.layer[1].data
         node_chart = chart.layer[1]
+    elif df is not None:
+        df_nodes = df
+        node_chart = alt.Chart(df_nodes)
     elif G is not None:
         if pos is None: pos = nx.drawing.layout.kamada_kawai_layout(G)
+        if isinstance(subset, list) and not subset_as_filter: # drop unwanted nodes before building the frame instead of slicing it afterwards
+            G, subset = G.subgraph(subset), None
         df_nodes = to_pandas_nodes(G, pos)
         node_chart = alt.Chart(df_nodes)
-    else: raise ValueError('one of G, chart or layer is required to draw.')
+    else: raise ValueError('one of G, chart, layer or df is required to draw.')
 
-    marker_attrs, encoded_attrs = {}, {}
+    marker_attrs, encoded_attrs, subset_filter = {}, {}, None
     legend = {} if legend else None
+    cols = df_nodes.columns # cached for the membership checks below
 
 
     # ---------- Handle the arguments ------------
 
     # Restrict to a given subset
     if isinstance(subset, list):
-        df_nodes = node_chart.data = df_nodes.loc[subset]
+        if subset_as_filter: subset_filter = alt.FieldOneOfPredicate(field = 'node', oneOf = subset)
+        else: # positional take of the matching rows: one gather pass, and names absent from G are ignored (label-based .loc would hash-validate each key and raise)
+            idx = df_nodes.index.get_indexer_for(subset)
+            df_nodes = node_chart.data = df_nodes.take(idx[idx >= 0])
     elif subset is not None: raise TypeError('node_subset must be a list or None.')
 
     # Size
-    if isinstance(size, str): encoded_attrs['size'] = alt.Size(size, legend = legend)
-    elif isinstance(size, int): marker_attrs['size'] = size
-    else: raise TypeError('node_size must be a string or int.')
+    _route('node_size', size, 'size', marker_attrs, encoded_attrs, legend)
 
     # Shape
     if not isinstance(shape, str): raise TypeError('shape must be a string (either an altair point-mark shape or an edge attribute containing the same).')
-    elif shape in df_nodes.columns: encoded_attrs['shape'] = alt.Shape(shape, legend = legend)
+    elif shape in cols: encoded_attrs['shape'] = alt.Shape(shape, legend = legend)
     else: marker_attrs['shape'] = shape
 
     # Fill colour
     if colour is not None: # allow nodes to be outlines with no fill
         if not isinstance(colour, str): raise TypeError('colour must be a string or None for no fill.')
-        if colour in df_nodes.columns: encoded_attrs['fill'] = colour
+        if colour in cols: encoded_attrs['fill'] = colour
         else: marker_attrs['fill'] = colour
 
     # Outline width
-    if isinstance(outline_width, str): encoded_attrs['strokeWidth'] = alt.Size(outline_width, legend = legend)
-    elif isinstance(outline_width, (float, int)): marker_attrs['strokeWidth'] = outline_width
-    else: raise TypeError('linewidths must be a string or int.')
+    _route('outline_width', outline_width, 'strokeWidth', marker_attrs, encoded_attrs, legend)
 
     # Outline dashes
     if outline_dash_and_gap_lengths is not None: # allow no dashes
         if not (isinstance(outline_dash_and_gap_lengths, str) or (isinstance(outline_dash_and_gap_lengths, tuple) and len(outline_dash_and_gap_lengths) == 2 and isinstance(outline_dash_and_gap_lengths[0], (float, int)) and isinstance(outline_dash_and_gap_lengths[1], (float, int)))):
             raise TypeError('outline_dash_and_gap_lengths must be None or a pair of numbers representing the lengths of dashes and gaps between dashes or a node attribute containing the same or containing strings.')
-        if outline_dash_and_gap_lengths in df_nodes.columns: encoded_attrs['strokeDash'] = alt.StrokeDash(outline_dash_and_gap_lengths, legend = legend)
+        if outline_dash_and_gap_lengths in cols: encoded_attrs['strokeDash'] = alt.StrokeDash(outline_dash_and_gap_lengths, legend = legend)
         elif isinstance(outline_dash_and_gap_lengths, str): raise ValueError(f'outline_dash_and_gap_lengths was set to a string (\'{outline_dash_and_gap_lengths}\') not matching any edge attribute; its allowed values are None or a pair of numbers representing the lengths of dashes and gaps between dashes or a node attribute containing the same or containing strings.')
         else: marker_attrs['strokeDash'] = outline_dash_and_gap_lengths
 
     # Outline colour
     if outline_colour is not None: # match fill colour
         if not isinstance(outline_colour, str): raise TypeError('outline_colour must be a string or None to match fill colour.')
-        if outline_colour in df_nodes.columns: encoded_attrs['color'] = outline_colour
+        if outline_colour in cols: encoded_attrs['color'] = outline_colour
         else: marker_attrs['color'] = outline_colour
 
     # Opacity
@@ -385,13 +432,14 @@ def draw_networkx_nodes(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     # ---------- Finalise the fields and construct the visualisation ------------
 
-    encoded_attrs = dict(x = alt.X('x').axis(None), y = alt.Y('y').axis(None), **encoded_attrs)
+    encoded_attrs = dict(x = _X_ENC, y = _Y_ENC, **encoded_attrs)
 
     # Inject custom fields without restrictions or safeguards
     if mark_kwargs is not None: marker_attrs = dict(marker_attrs, **mark_kwargs)
     if encode_kwargs is not None: encoded_attrs = dict(encoded_attrs, **encode_kwargs)
 
     node_chart = node_chart.mark_point(**marker_attrs).encode(**encoded_attrs)
+    if subset_filter is not None: node_chart = node_chart.transform_filter(subset_filter)
 
     if chart is not None: chart.layer[1] = node_chart
 
@@ -400,7 +448,7 @@ def draw_networkx_nodes(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
 
 def draw_networkx_labels(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None,
-    chart: alt.Chart = None, layer: alt.Chart = None, subset: list = None,
+    chart: alt.Chart = None, layer: alt.Chart = None, df: pd.DataFrame = None, subset: list = None, subset_as_filter = False,
     label: str = None, font_size = 15, font_colour = 'black',
     mark_kwargs: dict[str, ...] = None, encode_kwargs: dict[str, ...] = None):
     '''Draw the node labels of graph G using Altair, with control over various features, including node filtering, and font.
@@ -415,7 +463,11 @@ def draw_networkx_labels(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
     :param chart: A pre-existing chart to draw over.
     :param layer: A pre-existing chart layer to draw in.
-    :param subset: Subset of nodes to draw.
+    :param df: A pre-computed output of `to_pandas_nodes` to draw instead of rebuilding it from G and pos
+        (used by draw_networkx to share one frame construction across layers).
+    :param subset: Subset of nodes to draw; entries matching no node are ignored (as for the edge subsets).
+    :param subset_as_filter: Whether to apply subset as a Vega transform_filter on the full dataset instead of slicing the DataFrame;
+        this avoids copying the data and keeps a single canonical dataset in the spec (at the cost of shipping the filtered-out rows in it).
 
     :param label: Either a string to use as identical label for all nodes or a node attribute containing strings.
         Note that the auto-generated 'node' attribute contains node names.
@@ -433,48 +485,56 @@ def draw_networkx_labels(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
     elif chart is not None:
         df_nodes = chart.layer[1].data
         node_chart = chart.layer[1]
+    elif df is not None:
+        df_nodes = df
+        node_chart = alt.Chart(df_nodes)
     elif G is not None:
         if pos is None: pos = nx.drawing.layout.kamada_kawai_layout(G)
+        if isinstance(subset, list) and not subset_as_filter: # drop unwanted nodes before building the frame instead of slicing it afterwards
+            G, subset = G.subgraph(subset), None
         df_nodes = to_pandas_nodes(G, pos)
         node_chart = alt.Chart(df_nodes)
-    else: raise ValueError('one of G, chart or layer is required to draw.')
+    else: raise ValueError('one of G, chart, layer or df is required to draw.')
 
-    marker_attrs, encoded_attrs = {}, {}
+    marker_attrs, encoded_attrs, subset_filter = {}, {}, None
+    cols = df_nodes.columns # cached for the membership checks below
 
 
     # ---------- Handle the arguments ------------
 
     # Restrict to a given subset
     if isinstance(subset, list):
-        df_nodes = node_chart.data = df_nodes.loc[subset]
+        if subset_as_filter: subset_filter = alt.FieldOneOfPredicate(field = 'node', oneOf = subset)
+        else: # positional take of the matching rows: one gather pass, and names absent from G are ignored (label-based .loc would hash-validate each key and raise)
+            idx = df_nodes.index.get_indexer_for(subset)
+            df_nodes = node_chart.data = df_nodes.take(idx[idx >= 0])
     elif subset is not None: raise TypeError('node_subset must be a list or None.')
 
     # Text
     if not isinstance(label, str): raise TypeError('label must be a string.')
-    if label in df_nodes.columns: encoded_attrs['text'] = label
+    if label in cols: encoded_attrs['text'] = label
     else: marker_attrs['text'] = label
 
     # Size
-    if isinstance(font_size, str): encoded_attrs['size'] = alt.Size(font_size, legend = None)
-    elif isinstance(font_size, int): marker_attrs['size'] = font_size
-    else: raise TypeError('font_size must be a string or int.')
+    _route('font_size', font_size, 'size', marker_attrs, encoded_attrs)
 
     # Colour
     if not isinstance(font_colour, str): raise TypeError('font_color must be a string.')
-    if font_colour in df_nodes.columns: encoded_attrs['fill'] = font_colour
+    if font_colour in cols: encoded_attrs['fill'] = font_colour
     else: marker_attrs['fill'] = font_colour
 
 
     # ---------- Finalise the fields and construct the visualisation ------------
 
     marker_attrs = dict(baseline = 'middle', **marker_attrs)
-    encoded_attrs = dict(x = alt.X('x').axis(None), y = alt.Y('y').axis(None), **encoded_attrs)
+    encoded_attrs = dict(x = _X_ENC, y = _Y_ENC, **encoded_attrs)
 
     # Inject custom fields without restrictions or safeguards
     if mark_kwargs is not None: marker_attrs = dict(marker_attrs, **mark_kwargs)
     if encode_kwargs is not None: encoded_attrs = dict(encoded_attrs, **encode_kwargs)
 
     node_chart = node_chart.mark_text(**marker_attrs).encode(**encoded_attrs)
+    if subset_filter is not None: node_chart = node_chart.transform_filter(subset_filter)
 
     if chart is not None: chart.layer[1] = node_chart
 
@@ -482,7 +542,7 @@ def draw_networkx_labels(G: nx.Graph = None, pos: dict[..., tuple[float, float]]
 
 
 
-def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None, chart: alt.Chart = None,
+def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None, layout = 'kamada_kawai', chart: alt.Chart = None,
     node_subset: list = None, edge_subset: list = None, show_orphans = True, show_self_loops = True,
     node_size: int | str = 400, node_shape = 'circle', node_colour = 'teal', node_cmap: str = None, node_alpha = 1.,
     node_outline_width: float | str = 1., node_outline_dash_and_gap_lengths: tuple[float, float] | str = None, node_outline_colour: str = None,
@@ -494,9 +554,9 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
     loop_radius = .05, loop_angle = 90., loop_n_points = 30,
     curved_edges = False, edge_control_points: list[tuple[float, float]] = None, edge_interpolation = 'basis',
     edge_mark_kwargs: dict[str, ...] = None, edge_encode_kwargs: dict[str, ...] = None,
-    arrow_width = 2, arrow_length = .1, arrow_length_is_relative = True, arrow_colour = 'black', arrow_cmap: str = None, arrow_alpha = 1., arrow_legend = False,
+    show_arrows = True, arrow_width = 2, arrow_length = .1, arrow_length_is_relative = True, arrow_colour = 'black', arrow_cmap: str = None, arrow_alpha = 1., arrow_legend = False,
     arrow_mark_kwargs: dict[str, ...] = None, arrow_encode_kwargs: dict[str, ...] = None,
-    chart_width: float | None = 500., chart_height: float | None = 300., chart_padding = .05):
+    chart_width: float | None = 500., chart_height: float | None = 300., chart_padding = .05, use_vegafusion = False, memoise = False):
     '''Draw the graph G using Altair, with control over node, edge and arrow features, including filtering and curved edges.
     
     Note that for arguments which accept node or edge attributes as alternatives to fixed values there are additional options generated in the drawing process:
@@ -523,10 +583,13 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
     :param pos: The node positions of G, as produced by any of the `nx.*_layout functions`, e.g. `nx.kamada_kawai_layout`,
         which is the default if pos is None (called with no edge attribute to use as weights, hence possibly missing out on more meaningful non-default positions).
         Note that most layouts use random seeds; for reproducible results set `np.random.seed(...)` before they are called.
+    :param layout: The layout to compute if pos is None: one of 'kamada_kawai', 'spring', 'circular' and 'fast_spring', or any callable taking G and returning a pos-like dictionary.
+        'fast_spring' is `fast_spring_layout` (exported by default), a numba-compiled force-directed layout recommended for graphs with hundreds of nodes or more,
+        for which the default 'kamada_kawai' becomes the dominant drawing cost.
     :param chart: A pre-existing chart to draw over.
 
-    :param node_subset: Subset of nodes to draw.
-    :param edge_subset: Subset of edges to draw.
+    :param node_subset: Subset of nodes to draw; entries matching no node are ignored (as for edge_subset).
+    :param edge_subset: Subset of edges to draw; entries matching no edge are ignored.
     :param show_orphans: Whether to draw nodes with no edges.
     :param show_self_loops: Whether to draw edges starting and ending on the same node;
         nodes with only self-loops will still be drawn (though edge-less) unless show_orphans is also False.
@@ -600,6 +663,8 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
     :param edge_mark_kwargs: Custom fields to inject into the edge layer's `.mark_line` call without restrictions or safeguards; will overwrite existing fields on overlaps.
     :param edge_encode_kwargs: Custom fields to inject into the edge layer's `.encode` call without restrictions or safeguards; will overwrite existing fields on overlaps.
 
+    :param show_arrows: Whether to draw the arrow layer of directed graphs; skipping it (frame and all) halves the edge-related marks,
+        useful when direction is conveyed by some other channel or is irrelevant to the reader.
     :param arrow_width: Either an int or an edge attribute containing ints.
     :param arrow_length: The proportion of the line to be occupied by the arrow.
     :param arrow_length_is_relative: Whether arrow_length should be interpreted as a proportion of its edge length instead of an absolute measure.
@@ -618,9 +683,18 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
         either size is allowed to be None (though not both), letting the graph's own aspect ratio determine the other;
         if both are not None, then the graph's aspect ratio is reshaped to the given one.
     :param chart_padding: Proportion of the larger of the two axes to use as padding between graph and chart borders (followed by a slight padding increase due to final aspect ratio adjustments).
+    :param use_vegafusion: Whether to enable Altair's VegaFusion data transformer (requires the optional vegafusion package, installable with the 'speed' extra),
+        which evaluates data transforms in its own backend rather than in the browser; recommended for graphs with thousands of elements.
+        NOTE: this is a global Altair setting, so it remains enabled for subsequently created charts until changed with `alt.data_transformers.enable(...)`.
+    :param memoise: Whether to reuse the layout and layer DataFrames computed by the previous draw_networkx call on this same G object
+        (kept in a weak per-graph cache) when all the arguments shaping them are unchanged, so that only the styling is re-applied;
+        intended for repeated cosmetic redraws of the same graph, e.g. trying out colours in a notebook.
+        If pos is None this also reuses the previously computed layout rather than re-running (and re-randomising) it.
+        NOTE: the cache keys on node and edge counts and on the pos coordinate values, but cannot detect changed node or edge attribute values,
+        so leave this False (the default) if those change between calls.
 
     :return: An Altair chart of the given graph; its possible layers (`.layer`) are [edges, arrows, nodes, labels], in this order,
-        but arrows are present only if G is directed and labels only if node_label is not None.
+        but arrows are present only if G is directed (and show_arrows is not disabled) and labels only if node_label is not None.
         Note: the node coordinates will be different from those in the input pos, as scaling takes place to ensure that graph and chart aspect ratios match
         (so that the x and y axes' units are equal);
         in particular, the shorter axis will have length of approximately 1 + 2 * chart_padding
@@ -629,36 +703,79 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
         The chart size and axes' domains can be copied to a new chart with the `copy_size_and_axes` function (exported by default),
         or can be extracted manually with, e.g. `output_chart.width` and `output_chart.encoding.x['scale']['domain']`.
     '''
-    if not (show_self_loops and show_orphans):
-        G = deepcopy(G)
-        if not show_self_loops: G.remove_edges_from(nx.selfloop_edges(G))
-        if not show_orphans: G.remove_nodes_from(list(nx.isolates(G))) # wants a non-generator iterable
-    
-    if not pos: pos = nx.drawing.layout.kamada_kawai_layout(G)
+    # Fail fast on nothing to draw, before any layout or frame work (also covers graphs emptied by the filtering below)
+    if G is None or not G.number_of_nodes(): raise ValueError('G does not contain any nodes or edges.')
 
+    cache_G = G # memoise keys on the caller's graph, since the filtering below wraps G in per-call views which no later call would ever present again
 
-    # ---------- Scale the coordinates ------------
+    # Hide self-loops/orphans through read-only views rather than pruning a deepcopy, which would duplicate
+    # every node/edge attribute dict just for the read-only frame-building below
+    if not show_self_loops: G = nx.restricted_view(G, [], list(nx.selfloop_edges(G, keys = True) if G.is_multigraph() else nx.selfloop_edges(G)))
+    if not show_orphans: G = nx.subgraph_view(H := G, filter_node = lambda n: H.degree(n) > 0) # binding H as the pre-view graph avoids a self-referential filter
 
     if chart_width is None and chart_height is None: raise ValueError('chart_width and chart_height cannot both be None; if one is None then the other is determined by the graph\'s own aspect ratio.')
 
-    pos_xs, pos_ys = zip(*pos.values())
-    x_range, y_range = max(pos_xs) - min(pos_xs), max(pos_ys) - min(pos_ys)
-    if chart_width is None: chart_width = chart_height * x_range / y_range
-    if chart_height is None: chart_height = chart_width * y_range / x_range
+    # Query these once (AFTER the orphan/self-loop filtering above); number_of_* avoids materialising the .edges/.nodes views just for their len
+    n_edges, n_nodes, directed = G.number_of_edges(), G.number_of_nodes(), G.is_directed()
+    if not n_nodes: raise ValueError('G does not contain any nodes or edges.')
+
+    # Resolve the control-point default here (same expression as in the edge and arrow draws) so that the shared frames can be built once
+    if edge_control_points is None: edge_control_points = _CURVED_CONTROL_POINTS if curved_edges else _STRAIGHT_CONTROL_POINTS
+
+
+    # ---------- Compute the layout, scale the coordinates and build the layer frames (reusing the previous call's if memoised) ------------
 
-    # Scale x and y to [0,1] (so that loop_radius values are consistent across charts)
-    pos = {n: (0. if x_range == 0 else (xy[0] - min(pos_xs)) / x_range, 0. if y_range == 0 else (xy[1] - min(pos_ys)) / y_range) for n, xy in pos.items()}
-    if chart_width != chart_height: # Stretch the coordinate corresponding to the larger chart size so that aspect ratios match (and therefore x and y axes' units are equal)
-        pos = {n: (xy[0] * chart_width/chart_height, xy[1]) if chart_width >= chart_height else (xy[0], xy[1] * chart_height/chart_width) for n, xy in pos.items()}
+    df_edges = df_arrows = df_nodes = None
+    cache_key = (n_nodes, n_edges, directed, show_self_loops, show_orphans,
+        np.asarray([pos[n] for n in G.nodes], dtype = float).tobytes() if pos else None, # the coordinate values, not id(pos): object ids can be recycled after garbage collection, silently serving stale frames
+        (layout if isinstance(layout, str) else id(layout)) if not pos else None, # the layout only shapes the frames when pos is not given
+        chart_width, chart_height, chart_padding,
+        loop_radius, loop_angle, loop_n_points, tuple(edge_control_points), show_arrows, arrow_length, arrow_length_is_relative) if memoise else None
+
+    if memoise and (hit := _frame_cache.get(cache_G)) is not None and hit[0] == cache_key:
+        pos, chart_width, chart_height, df_edges, df_arrows, df_nodes = hit[1] # the resolved chart sizes are cached too, in case one was passed as None
+    else:
+        if not pos:
+            if callable(layout): pos = layout(G)
+            elif layout in _LAYOUTS: pos = _LAYOUTS[layout](G)
+            else: raise ValueError(f'layout must be a callable or one of {sorted(_LAYOUTS)}.')
+
+        # Scale the coordinates
+        pos_xs, pos_ys = zip(*pos.values())
+        x_range, y_range = max(pos_xs) - min(pos_xs), max(pos_ys) - min(pos_ys)
+        if chart_width is None: chart_width = chart_height * x_range / y_range
+        if chart_height is None: chart_height = chart_width * y_range / x_range
+
+        # Scale x and y to [0,1] (so that loop_radius values are consistent across charts)
+        pos = {n: (0. if x_range == 0 else (xy[0] - min(pos_xs)) / x_range, 0. if y_range == 0 else (xy[1] - min(pos_ys)) / y_range) for n, xy in pos.items()}
+        if chart_width != chart_height: # Stretch the coordinate corresponding to the larger chart size so that aspect ratios match (and therefore x and y axes' units are equal)
+            pos = {n: (xy[0] * chart_width/chart_height, xy[1]) if chart_width >= chart_height else (xy[0], xy[1] * chart_height/chart_width) for n, xy in pos.items()}
+
+        pos_array = _pos_to_array(G, pos) # the scaled coordinates stacked once, shared by every frame builder below
+        if n_edges:
+            # For directed graphs, gather the endpoint geometry once and share it between the edge and arrow frames
+            geometry = _edge_geometry(G, pos, pos_array = pos_array) if directed and show_arrows else None
+            df_edges = to_pandas_edges(G, pos, control_points = edge_control_points, loop_radius = loop_radius, loop_angle = loop_angle, loop_n_points = loop_n_points, _geometry = geometry, _pos_array = pos_array)
+            if directed and show_arrows: df_arrows = to_pandas_edge_arrows(G, pos, length = arrow_length, length_is_relative = arrow_length_is_relative, control_points = edge_control_points, _geometry = geometry)
+        if n_nodes: df_nodes = to_pandas_nodes(G, pos, _pos_array = pos_array)
+
+        if memoise: _frame_cache[cache_G] = (cache_key, (pos, chart_width, chart_height, df_edges, df_arrows, df_nodes))
 
 
     # ---------- Construct the layers ------------
 
+    if use_vegafusion:
+        import vegafusion # noqa: F401 # fail here, on enabling, rather than on first chart display: Altair pre-registers the name, so enabling succeeds (and breaks every later chart) even without the package
+        alt.data_transformers.enable('vegafusion')
+    if edge_tooltip is not None and n_edges > _MAX_TOOLTIP_EDGES:
+        warnings.warn(f'edge_tooltip ignored: G has more than {_MAX_TOOLTIP_EDGES} edges, and per-edge hover points at that scale make the chart unresponsive.', stacklevel = 2)
+        edge_tooltip = None
+
     layers = []
 
     # Edges
-    if len(G.edges):
-        edges = draw_networkx_edges(G, pos, chart = chart, subset = edge_subset,
+    if n_edges:
+        edges = draw_networkx_edges(G, pos, chart = chart, df = df_edges, subset = edge_subset,
             width = edge_width, dash_and_gap_lengths = edge_dash_and_gap_lengths, colour = edge_colour, cmap = edge_cmap, alpha = edge_alpha,
             tooltip = edge_tooltip, legend = edge_legend,
             loop_radius = loop_radius, loop_angle = loop_angle, loop_n_points = loop_n_points,
@@ -667,8 +784,8 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
         layers.append(edges)
 
         # Arrows
-        if nx.is_directed(G):
-            arrows = draw_networkx_arrows(G, pos, chart = chart, subset = edge_subset,
+        if directed and show_arrows:
+            arrows = draw_networkx_arrows(G, pos, chart = chart, df = df_arrows, subset = edge_subset,
                 width = arrow_width, dash_and_gap_lengths = edge_dash_and_gap_lengths, length = arrow_length, length_is_relative = arrow_length_is_relative,
                 colour = arrow_colour, cmap = arrow_cmap, alpha = arrow_alpha,
                 tooltip = edge_tooltip, legend = arrow_legend,
@@ -677,8 +794,8 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
             layers.append(arrows)
 
     # Nodes
-    if len(G.nodes):
-        nodes = draw_networkx_nodes(G, pos, chart = chart, subset = node_subset,
+    if n_nodes:
+        nodes = draw_networkx_nodes(G, pos, chart = chart, df = df_nodes, subset = node_subset,
             size = node_size, shape = node_shape,
             colour = node_colour, cmap = node_cmap, alpha = node_alpha,
             outline_width = node_outline_width, outline_dash_and_gap_lengths = node_outline_dash_and_gap_lengths, outline_colour = node_outline_colour,
@@ -688,7 +805,7 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
 
         # Node labels
         if node_label:
-            labels = draw_networkx_labels(G, pos, chart = chart, subset = node_subset,
+            labels = draw_networkx_labels(G, pos, chart = chart, df = df_nodes, subset = node_subset,
                 label = node_label, font_size = node_font_size, font_colour = node_font_colour,
                 mark_kwargs = node_label_mark_kwargs, encode_kwargs = node_label_encode_kwargs)
             layers.append(labels)
@@ -714,7 +831,7 @@ def draw_networkx(G: nx.Graph = None, pos: dict[..., tuple[float, float]] = None
 
         x_padding, y_padding = (long_padding, short_padding) if chart_width >= chart_height else (short_padding, long_padding)
 
-        return alt.layer(*layers).encode(
+        return alt.LayerChart(layer = layers).encode( # direct construction, as in to_chart, rather than alt.layer's re-validating dispatch
             alt.X().scale(domain = (min_x - x_padding, max_x + x_padding)),
             alt.Y().scale(domain = (min_y - y_padding, max_y + y_padding))
         ).properties(width = chart_width, height = chart_height)
@@ -0,0 +1,109 @@
+import numpy as np
+import networkx as nx
+
+import pickle
+from hashlib import blake2b
+from pathlib import Path
+
+
+_numba_spring_kernel = None
+
+def _spring_kernel():
+    '''Lazily compile (and cache) the numba Fruchterman-Reingold kernel used by `fast_spring_layout`; None if numba is not installed.
+    '''
+    global _numba_spring_kernel
+    if _numba_spring_kernel is None:
+        try: from numba import njit
+        except ImportError:
+            _numba_spring_kernel = False
+            return None
+
+        @njit(cache = True, fastmath = True)
+        def kernel(xy, indptr, indices, iterations):
+            n = xy.shape[0]
+            k = 1 / np.sqrt(n) # optimal pairwise distance for coordinates in the unit square
+            t = .1 # initial temperature (i.e. largest allowed step), annealed linearly as in nx.spring_layout
+            dt = t / (iterations + 1)
+            disp = np.empty((n, 2))
+            for _ in range(iterations):
+                for i in range(n):
+                    dx = dy = 0.
+                    xi0, xi1 = xy[i, 0], xy[i, 1]
+                    for j in range(n): # repulsion from every other node
+                        if i != j:
+                            d0, d1 = xi0 - xy[j, 0], xi1 - xy[j, 1]
+                            d2 = max(d0 * d0 + d1 * d1, 1e-8)
+                            f = k * k / d2
+                            dx += d0 * f
+                            dy += d1 * f
+                    for p in range(indptr[i], indptr[i + 1]): # attraction along edges
+                        j = indices[p]
+                        d0, d1 = xi0 - xy[j, 0], xi1 - xy[j, 1]
+                        f = np.sqrt(d0 * d0 + d1 * d1) / k
+                        dx -= d0 * f
+                        dy -= d1 * f
+                    disp[i, 0], disp[i, 1] = dx, dy
+                for i in range(n):
+                    d0, d1 = disp[i, 0], disp[i, 1]
+                    d = np.sqrt(d0 * d0 + d1 * d1)
+                    if d > 1e-12:
+                        scale = min(d, t) / d
+                        xy[i, 0] += d0 * scale
+                        xy[i, 1] += d1 * scale
+                t -= dt
+            return xy
+
+        _numba_spring_kernel = kernel
+    return _numba_spring_kernel or None
+
+
+
+def fast_spring_layout(G: nx.Graph, iterations = 50, seed: int = None):
+    '''Position nodes with the Fruchterman-Reingold force-directed algorithm, compiled with numba when available
+    (install with the 'speed' extra; without it this simply delegates to `nx.spring_layout`).
+    Intended for graphs large enough (hundreds of nodes and up) for the pure-Python layouts to dominate drawing time;
+    note that, unlike `nx.spring_layout`, the compiled version ignores edge weights.
+
+    :param G: The graph to lay out.
+    :param iterations: Number of force-simulation iterations.
+    :param seed: Seed for the random initial positions; None for non-reproducible ones.
+
+    :return: A dictionary of node positions, as produced by the `nx.*_layout` functions (and accepted by the drawing functions' pos argument).
+    '''
+    if (kernel := _spring_kernel()) is None: return nx.spring_layout(G, iterations = iterations, seed = seed)
+
+    A = nx.to_scipy_sparse_array(G, format = 'csr')
+    xy = np.random.default_rng(seed).random((A.shape[0], 2))
+    return dict(zip(G, kernel(xy, A.indptr.astype(np.intp), A.indices.astype(np.intp), iterations)))
+
+
+
+_LAYOUTS = dict(kamada_kawai = nx.drawing.layout.kamada_kawai_layout, spring = nx.spring_layout, circular = nx.circular_layout, fast_spring = fast_spring_layout)
+
+
+def cached_layout(G: nx.Graph, cache_dir, layout = 'kamada_kawai'):
+    '''Compute the given layout for G, persisting the result under cache_dir and transparently reloading it
+    on later calls with the same graph and layout — including across sessions, e.g. notebook kernel restarts —
+    so that re-drawing an unchanged graph costs a single small disk read rather than a layout computation.
+    Note that layouts using random seeds will keep whichever positions were cached first; delete the cache_dir contents to recompute.
+
+    :param G: The graph to lay out.
+    :param cache_dir: The directory to keep cached positions in (created if missing); one small file per distinct graph-and-layout pair.
+    :param layout: One of 'kamada_kawai', 'spring', 'circular' and 'fast_spring', or any callable taking G and returning a pos-like dictionary.
+
+    :return: A dictionary of node positions, as produced by the `nx.*_layout` functions (and accepted by the drawing functions' pos argument).
+    '''
+    if callable(layout): name, layout_function = getattr(layout, '__qualname__', repr(layout)), layout
+    elif layout in _LAYOUTS: name, layout_function = layout, _LAYOUTS[layout]
+    else: raise ValueError(f'layout must be a callable or one of {sorted(_LAYOUTS)}.')
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents = True, exist_ok = True)
+    # Hash attributes too, not just the topology: the default layouts consume edge weights, so changed attributes must invalidate the cache
+    path = cache_dir / f'{blake2b(pickle.dumps((name, list(G.nodes(data = True)), list(G.edges(data = True)))), digest_size = 16).hexdigest()}.pkl'
+
+    if path.exists():
+        with path.open('rb') as f: return pickle.load(f)
+    pos = layout_function(G)
+    with path.open('wb') as f: pickle.dump(pos, f)
+    return pos
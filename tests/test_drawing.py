@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import altair_nx as anx
+from altair_nx.core import to_pandas_edge_arrows, to_pandas_edges, to_pandas_nodes
+
+GRAPH_TYPES = [nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph]
+
+
+def example(graph_type):
+    '''A small graph exercising the awkward cases: a self-loop, an orphan, node/edge attributes, and (for multigraphs) a parallel edge.'''
+    G = graph_type()
+    G.add_edge('a', 'b', weight = 1.)
+    G.add_edge('b', 'c', weight = 2.)
+    G.add_edge('c', 'c')
+    G.add_node('d', colour = 'red')
+    if G.is_multigraph(): G.add_edge('a', 'b', weight = 3.)
+    return G, nx.circular_layout(G)
+
+
+@pytest.mark.parametrize('graph_type', GRAPH_TYPES)
+def test_to_pandas_nodes_round_trip(graph_type):
+    G, pos = example(graph_type)
+    df = to_pandas_nodes(G, pos)
+
+    assert list(df['node']) == list(G.nodes)
+    assert np.allclose(df[['x', 'y']].to_numpy(), [pos[n] for n in G.nodes], atol = 1e-6)
+    assert df.loc['d', 'colour'] == 'red'
+
+
+@pytest.mark.parametrize('graph_type', GRAPH_TYPES)
+def test_to_pandas_edges_round_trip(graph_type):
+    G, pos = example(graph_type)
+    df = to_pandas_edges(G, pos, control_points = [(.5, 0.)], loop_n_points = 5)
+    edges = list(G.edges) # (u, v) pairs, or (u, v, key) triples for multigraphs, matching the 'pair' column
+
+    assert set(df['pair']) == set(edges)
+    for i, e in enumerate(edges):
+        rows = df[df['edge'] == i]
+        assert np.allclose(rows.iloc[0][['x', 'y']].astype(float), pos[e[0]], atol = 1e-6) # first row at the source
+        if e[0] != e[1]: assert np.allclose(rows.iloc[-1][['x', 'y']].astype(float), pos[e[1]], atol = 1e-6) # last row at the target (self-loops circle back instead)
+        if (weight := G.edges[e].get('weight')) is not None: assert (rows['weight'] == weight).all() # attributes aligned per edge, repeated across its rows
+
+
+@pytest.mark.parametrize('graph_type', [nx.DiGraph, nx.MultiDiGraph])
+def test_to_pandas_edge_arrows_round_trip(graph_type):
+    G, pos = example(graph_type)
+    df = to_pandas_edge_arrows(G, pos, length = .1, length_is_relative = True)
+    loops = {e for e in G.edges if e[0] == e[1]}
+
+    assert set(df['pair']) == set(G.edges) - loops # no arrows for self-loops
+    assert len(df) == 2 * (G.number_of_edges() - len(loops)) # one tip and one tail row per remaining edge
+    for _, row in df.iloc[0::2].iterrows(): # tips sit on the target nodes
+        assert np.allclose([row['x'], row['y']], pos[row['pair'][1]], atol = 1e-6)
+
+
+def test_draw_layer_composition_and_show_arrows():
+    G = nx.gn_graph(6, seed = 0)
+    pos = nx.circular_layout(G)
+
+    assert len(anx.draw_networkx(G, pos, node_label = 'node').layer) == 4 # edges, arrows, nodes, labels
+    assert len(anx.draw_networkx(G, pos).layer) == 3
+    assert len(anx.draw_networkx(G, pos, show_arrows = False).layer) == 2
+
+
+def test_subsets_and_subset_as_filter():
+    G = nx.path_graph(5)
+    pos = nx.circular_layout(G)
+
+    chart = anx.draw_networkx(G, pos, edge_subset = [(0, 1), (7, 8)], node_subset = [0, 1, 99])
+    assert set(chart.layer[0].data['pair']) == {(0, 1)} # entries matching nothing are ignored
+    assert list(chart.layer[1].data['node']) == [0, 1]
+
+    filtered = anx.draw_networkx_edges(G, pos, subset = [(0, 1)], subset_as_filter = True)
+    assert len(filtered.data) == 3 * G.number_of_edges() # the full dataset ships, with the restriction as a Vega transform
+    assert filtered.to_dict()['transform']
+
+
+def test_memoise_reuses_and_invalidates():
+    G = nx.path_graph(10)
+
+    c1 = anx.draw_networkx(G, layout = 'circular', memoise = True)
+    c2 = anx.draw_networkx(G, layout = 'circular', memoise = True)
+    assert c2.layer[1].data is c1.layer[1].data # same frames reused, not rebuilt
+
+    c3 = anx.draw_networkx(G, layout = 'kamada_kawai', memoise = True)
+    assert c3.layer[1].data is not c1.layer[1].data # a changed layout invalidates the cache
+
+
+def test_cached_layout(tmp_path):
+    G = nx.path_graph(6)
+
+    p1 = anx.cached_layout(G, tmp_path)
+    p2 = anx.cached_layout(G, tmp_path)
+    assert p1.keys() == p2.keys() and all(np.allclose(p1[n], p2[n]) for n in p1)
+    assert len(list(tmp_path.iterdir())) == 1 # second call reloaded the first's positions
+
+    nx.set_edge_attributes(G, {(0, 1): 9.}, 'weight')
+    anx.cached_layout(G, tmp_path)
+    assert len(list(tmp_path.iterdir())) == 2 # attribute changes invalidate, not just topology ones